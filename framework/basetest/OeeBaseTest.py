@@ -1,14 +1,317 @@
 from apamax.analyticsbuilder.basetest import AnalyticsBuilderBaseTest
 from pysys.constants import *
+import json, os, random, time
+
+class OutputIndex(object):
+	"""
+	The output events of the models in a correlator log, parsed once and indexed by model, output, partition and 
+	time. update reads the part of the log written since the previous update only, so queries during and after a 
+	long run do not parse the whole log again.
+
+	extract is the function turning a log file into output events, i.e. extractEventLoggerOutput. It is applied 
+	to the new complete lines of the log, which are copied to chunkfile for this.
+	"""
+
+	def __init__(self, extract, logfile, chunkfile):
+		self.extract = extract
+		self.logfile = logfile
+		self.chunkfile = chunkfile
+		self.offset = 0
+		# all events in the order they were logged
+		self.events = []
+		self.byOutput = {}
+		self.byKey = {}
+
+	def update(self):
+		"""Parses the lines logged since the previous update and returns the number of new events."""
+		if not os.path.exists(self.logfile):
+			return 0
+		if os.path.getsize(self.logfile) < self.offset:
+			# the log was replaced, start over
+			self.__init__(self.extract, self.logfile, self.chunkfile)
+		with open(self.logfile, 'rb') as f:
+			f.seek(self.offset)
+			data = f.read()
+		# a line that is still being written is left for the next update
+		end = data.rfind(b'\n') + 1
+		if end == 0:
+			return 0
+		with open(self.chunkfile, 'wb') as f:
+			f.write(data[:end])
+		self.offset += end
+		events = self.extract(self.chunkfile)
+		for evt in events:
+			self.events.append(evt)
+			self.byOutput.setdefault((evt['modelId'], evt['outputId']), []).append(evt)
+			self.byKey.setdefault((evt['modelId'], evt['outputId'], evt['partitionId'], evt['time']), []).append(evt)
+		return len(events)
+
+	def select(self, modelId, outputId, partitionId=None, time=None):
+		"""The events of an output of a model in the order they were logged, optionally only those of one partition or time."""
+		if partitionId is not None and time is not None:
+			return self.byKey.get((modelId, outputId, partitionId, time), [])
+		return [evt for evt in self.byOutput.get((modelId, outputId), []) 
+			if (partitionId is None or evt['partitionId'] == partitionId) and (time is None or evt['time'] == time)]
+
+	def series(self, selector, modelId, outputId='details', partitionId=None):
+		"""A property of the events of an output, e.g. a KPI of the details output, as a NumPy array in the order they were logged."""
+		import numpy as np
+		return np.array([evt['properties'][selector] for evt in self.select(modelId, outputId, partitionId)], dtype=float)
 
 class OeeBaseTest(AnalyticsBuilderBaseTest):
 
+	# the inputs to connect for each calculation path, as passed to createTestModel
+	PATH_INPUTS = {
+		1: {'status':'boolean', 'amount':'float', 'amount_ok':'float', 'amount_nok':None, 'qok':None},
+		2: {'status':'boolean', 'amount':'float', 'amount_ok':None, 'amount_nok':None, 'qok':'boolean'},
+		3: {'status':'boolean', 'amount':None, 'amount_ok':'float', 'amount_nok':'float', 'qok':None},
+		4: {'status':'boolean', 'amount':'float', 'amount_ok':None, 'amount_nok':'float', 'qok':None},
+	}
+
+	# values that are replaced when turning event strings into templates
+	TIME_SENTINEL = 987654321.25
+	VALUE_SENTINEL = 123456.75
+
 	def preInjectBlock(self, corr):
 		AnalyticsBuilderBaseTest.preInjectBlock(self, corr)
 		corr.injectEPL([self.project.APAMA_HOME +'/monitors/'+i+'.mon' for i in ['TimeFormatEvents']])
-		corr.injectEPL([self.project.SOURCE +'/src/eventdefinitions/'+i+'.mon' for i in ['Util','Parser','OEEEventDefinitions', 'ExpressionParser']])
+		corr.injectEPL([self.project.SOURCE +'/src/eventdefinitions/'+i+'.mon' for i in ['Util','Parser','OEEEventDefinitions', 'ExpressionParser', 'ShiftCalendar', 'Snapshot']])
+
+
+	def timestamp(self, t, *args, **kwargs):
+		self._sentTime = t
+		return AnalyticsBuilderBaseTest.timestamp(self, t, *args, **kwargs)
+
+	def inputEvent(self, identifier, value, *args, **kwargs):
+		# remember what is sent to the models, so it can be recalculated with the backfill engine
+		if not hasattr(self, 'sentInputs'):
+			self.sentInputs = []
+		self.sentInputs.append((getattr(self, '_sentTime', 0.0), kwargs.get('id'), identifier, value))
+		return AnalyticsBuilderBaseTest.inputEvent(self, identifier, value, *args, **kwargs)
+
+	def backfill(self, interval, ica, modelId='model_0', path=None, shiftPlan=''):
+		"""Recalculates the results of a model from the inputs sent to it, using the offline backfill engine."""
+		import oeebackfill
+		inputs = [(t, i, float(v)) for t, m, i, v in getattr(self, 'sentInputs', []) if m in (None, modelId)]
+		times, names, values = zip(*inputs)
+		engine = oeebackfill.BackfillEngine(interval, ica, path or oeebackfill.path_for(set(names)), shiftPlan)
+		results = [engine.feed(times, names, values)]
+		if getattr(self, '_sentTime', 0.0) > max(times):
+			# time moved on after the last inputs, so the block processed them
+			results.append(engine.finish())
+		return oeebackfill.concat_results(results)
+
+	def assertMatchesBackfill(self, interval, ica, modelId='model_0', path=None, tolerance=0.0001, shiftPlan=''):
+		"""Checks that the details output of a model matches the results recalculated by the backfill engine."""
+		import oeebackfill
+		expected = self.backfill(interval, ica, modelId, path, shiftPlan)
+		for kpi in oeebackfill.KPIS:
+			actual = self.details(kpi, modelId)
+			self.assertThat('len(actual) == len(expected)', kpi=kpi, actual=actual, expected=list(expected[kpi]))
+			mismatches = [(t, a, e) for t, a, e in zip(expected['time'], actual, expected[kpi]) if abs(a - e) > tolerance * 1.01]
+			self.assertThat('mismatches == []', kpi=kpi, mismatches=mismatches)
+
+	def _template(self, eventString):
+		"""Turns an event string with the sentinel time and value into a format string with {t} and {v} fields."""
+		if str(self.TIME_SENTINEL) not in eventString:
+			raise Exception(f'Cannot create a template from {eventString}')
+		eventString = eventString.replace('{', '{{').replace('}', '}}')
+		return eventString.replace(str(self.TIME_SENTINEL), '{t}').replace(str(self.VALUE_SENTINEL), '{v}')
+
+	def loadEvents(self, models, duration, rate, outOfOrder=0.0, gap=0.0, start=30.0, seed=1):
+		"""
+		Generates the event strings of a load test. models is a list of (modelId, path) pairs, each model gets an 
+		activation with the inputs of its calculation path rate times per second for duration seconds. outOfOrder 
+		is the fraction of activations that arrive one step late, gap the length of an outage halfway through in 
+		which no events are sent.
+
+		Returns the event strings and the number of activations sent, which excludes the outage.
+
+		The strings are formatted from one template per model and input instead of calling inputEvent for every 
+		event, so millions of events can be generated in seconds. They are not recorded for backfill.
+		"""
+		rand = random.Random(seed)
+		step = 1.0 / rate
+		tick = self._template(AnalyticsBuilderBaseTest.timestamp(self, self.TIME_SENTINEL))
+		def template(modelId, identifier, value):
+			return self._template(AnalyticsBuilderBaseTest.inputEvent(self, identifier, value, id=modelId, time=self.TIME_SENTINEL))
+		templates = [{
+				'status': {True: template(modelId, 'status', True), False: template(modelId, 'status', False)},
+				'qok': {True: template(modelId, 'qok', True), False: template(modelId, 'qok', False)},
+				'amounts': [template(modelId, identifier, self.VALUE_SENTINEL) 
+							for identifier in ('amount', 'amount_ok', 'amount_nok') if self.PATH_INPUTS[path][identifier]],
+				'path': path,
+			} for modelId, path in models]
+		state = [{'status': True, 'qok': True} for m in models]
+
+		events = []
+		late = []
+		activations = 0
+		outage = (start + duration / 2, start + duration / 2 + gap)
+		for i in range(int(duration * rate) + 1):
+			t = start + i * step
+			if outage[0] <= t < outage[1]:
+				continue
+			events.append(tick.format(t=t))
+			activations += len(models)
+			events.extend(late)
+			late = []
+			for m, s in zip(templates, state):
+				if i > 0 and rand.random() < 0.02:
+					s['status'] = not s['status']
+				activation = [m['status'][s['status']].format(t=t)]
+				if m['path'] == 2:
+					if i > 0 and rand.random() < 0.05:
+						s['qok'] = not s['qok']
+					activation.append(m['qok'][s['qok']].format(t=t))
+				amount = float(rand.randint(0, 10)) if s['status'] else 0.0
+				nok = float(rand.randint(0, 1)) if amount else 0.0
+				values = {1: (amount, amount - nok), 2: (amount,), 3: (amount - nok, nok), 4: (amount, nok)}[m['path']]
+				activation.extend(a.format(t=t, v=v) for a, v in zip(m['amounts'], values))
+				if i > 0 and rand.random() < outOfOrder:
+					late.extend(activation)
+				else:
+					events.extend(activation)
+		events.extend(late)
+		return events, activations
+
+	def processResources(self, process):
+		"""Returns the CPU seconds used and the resident memory in kB of a process, (None, None) where /proc is not available."""
+		try:
+			with open(f'/proc/{process.pid}/stat') as f:
+				fields = f.read().rsplit(')', 1)[1].split()
+			cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+			with open(f'/proc/{process.pid}/status') as f:
+				rss = int(next(line for line in f if line.startswith('VmRSS:')).split()[1])
+			return cpu, rss
+		except (OSError, ValueError, StopIteration, AttributeError):
+			return None, None
+
+	def outputIndex(self):
+		"""Returns the OutputIndex of the correlator log, updated with the outputs logged since the previous call."""
+		logfile = os.path.join(self.output, self.analyticsBuilderCorrelator.logfile)
+		index = getattr(self, '_outputIndex', None)
+		if index is None or index.logfile != logfile:
+			index = self._outputIndex = OutputIndex(self.apama.extractEventLoggerOutput, logfile, os.path.join(self.output, 'outputindex.log'))
+		index.update()
+		return index
+
+	def outputsByModel(self, outputId='timestamp'):
+		"""Returns the events of an output of all models, as a dictionary of lists keyed by model id."""
+		outputs = {}
+		for evt in self.outputIndex().events:
+			if evt['outputId'] == outputId:
+				outputs.setdefault(evt['modelId'], []).append(evt)
+		return outputs
+
+	def writeBenchmarkResults(self, results, name='benchmark.json'):
+		"""
+		Writes benchmark results to a JSON file in the output directory. If the benchmarkResults property is set 
+		(e.g. pysys run -XbenchmarkResults=/path/results.jsonl), they are also appended to that file as one line, 
+		so that results can be compared between releases.
+		"""
+		results = dict(results, test=self.descriptor.id, mode=str(self.mode or ''), timestamp=time.time())
+		with open(os.path.join(self.output, name), 'w') as f:
+			json.dump(results, f, indent=2)
+		history = getattr(self, 'benchmarkResults', None)
+		if history:
+			with open(history, 'a') as f:
+				f.write(json.dumps(results) + '\n')
+		self.log.info('Benchmark results: %s', results)
+
+	def storeSnapshots(self, store, outputId='snapshot'):
+		"""
+		Writes the latest snapshot of every partition of every model to a JSON file in the output directory, a local 
+		stand-in for the store a deployment keeps snapshots in. Returns the path of the file.
+		"""
+		latest = {}
+		for modelId, outputs in self.outputsByModel(outputId).items():
+			for evt in outputs:
+				latest[(modelId, evt.get('partitionId') or '')] = evt['value']
+		path = os.path.join(self.output, store)
+		with open(path, 'w') as f:
+			json.dump([{'modelId': m, 'partitionId': p, 'snapshot': s} for (m, p), s in sorted(latest.items())], f, indent=2)
+		return path
+
+	def restoreEvents(self, store, models=None):
+		"""
+		Returns the event strings sending the snapshots of a file written by storeSnapshots to the Restore input, for 
+		the model that output them or the model it is mapped to in models.
+		"""
+		with open(os.path.join(self.output, store)) as f:
+			snapshots = json.load(f)
+		events = []
+		for s in snapshots:
+			kwargs = {'partition': s['partitionId']} if s['partitionId'] else {}
+			modelId = (models or {}).get(s['modelId'], s['modelId'])
+			# not recorded for backfill, it is not an input of the calculation
+			events.append(AnalyticsBuilderBaseTest.inputEvent(self, 'restore', s['snapshot'], id=modelId, **kwargs))
+		return events
+
+	def startCpuProfile(self, correlator):
+		"""Clears and enables the CPU profiler of a correlator, so that the profile covers only what follows."""
+		correlator.manage(arguments=['-r', 'cpuProfile', 'reset'])
+		correlator.manage(arguments=['-r', 'cpuProfile', 'on'])
+
+	def stopCpuProfile(self, correlator, name='cpuProfile.csv'):
+		"""Retrieves the CPU profile of a correlator into the output directory, disables the profiler and returns the file."""
+		correlator.manage(stdout=name, arguments=['-r', 'cpuProfile', 'get'])
+		correlator.manage(arguments=['-r', 'cpuProfile', 'off'])
+		return os.path.join(self.output, name)
+
+	def cpuProfileReport(self, profile, activations, name='profile', prefix='apamax.analyticsbuilder.oee'):
+		"""
+		Turns a CPU profile retrieved with stopCpuProfile into a report of the time spent in each EPL action, ranked by 
+		the time spent in the action itself. The profiler samples what each context is doing, so the rows of an action 
+		(one per context and line) are summed up, and its samples stand in for a call count. Time per activation 
+		divides by the number of activations of the workload, to compare workloads of different lengths.
+
+		Only actions with a location starting with prefix are reported, pass prefix='' for all of them. The report is 
+		written as <name>.json and as a table to <name>.txt in the output directory, and returned as a list of rows.
+		"""
+		with open(profile) as f:
+			lines = [line.rstrip('\r\n') for line in f if line.strip()]
+		header = next(i for i, line in enumerate(lines) if 'location' in line.lower())
+		columns = [c.strip().lower() for c in lines[header].split(',')]
+		def column(*names, exclude=None):
+			return next(i for i, c in enumerate(columns) if any(n in c for n in names) and not (exclude and exclude in c))
+		location = column('location')
+		cumulative = column('cumulative')
+		cpu = column('cpu', exclude='cumulative')
+		samples = column('non-empty', 'nonempty')
+
+		actions = {}
+		for line in lines[header + 1:]:
+			fields = [f.strip() for f in line.split(',')]
+			if len(fields) < len(columns) or not fields[location].startswith(prefix):
+				continue
+			row = actions.setdefault(fields[location], {'action': fields[location], 'cpuTime': 0.0, 'cumulativeTime': 0.0, 'samples': 0})
+			row['cpuTime'] += float(fields[cpu])
+			row['cumulativeTime'] += float(fields[cumulative])
+			row['samples'] += int(float(fields[samples]))
+
+		total = sum(row['cpuTime'] for row in actions.values())
+		report = sorted(actions.values(), key=lambda row: (-row['cpuTime'], row['action']))
+		for rank, row in enumerate(report, 1):
+			row['rank'] = rank
+			row['share'] = row['cpuTime'] / total if total else 0.0
+			row['cpuTimePerActivation'] = row['cpuTime'] / activations if activations else None
+			row['cumulativeTimePerActivation'] = row['cumulativeTime'] / activations if activations else None
+
+		with open(os.path.join(self.output, name + '.json'), 'w') as f:
+			json.dump({'activations': activations, 'actions': report}, f, indent=2)
+		with open(os.path.join(self.output, name + '.txt'), 'w') as f:
+			f.write(f'{"rank":>4}  {"cpu":>10}  {"share":>6}  {"cumulative":>10}  {"samples":>8}  {"cpu/act":>10}  action\n')
+			for row in report:
+				f.write(f'{row["rank"]:>4}  {row["cpuTime"]:>10.4g}  {row["share"]:>6.1%}  {row["cumulativeTime"]:>10.4g}  '
+					f'{row["samples"]:>8}  {row["cpuTimePerActivation"] or 0.0:>10.3g}  {row["action"]}\n')
+		for row in report[:10]:
+			self.log.info('%2d. %-70s %5.1f%% of CPU, %.3g per activation', row['rank'], row['action'], row['share'] * 100, row['cpuTimePerActivation'] or 0.0)
+		return report
 
+	def details(self, selector, modelId='model_0', partitionId=None,time=None, outputId='details'):
+		return [evt['properties'][selector] for evt in self.outputIndex().select(modelId, outputId, partitionId, time)]
 
-	def details(self, selector, modelId='model_0', partitionId=None,time=None):
-		return [evt['properties'][selector] for evt in self.apama.extractEventLoggerOutput(self.analyticsBuilderCorrelator.logfile)
-			if evt['modelId'] == modelId and evt['outputId'] == 'details' and (partitionId == None or evt['partitionId'] == partitionId ) and (time == None or evt['time'] == time )]
\ No newline at end of file
+	def series(self, selector, modelId='model_0', partitionId=None, outputId='details'):
+		"""Returns a property of an output, e.g. a KPI of the details output, as a NumPy array."""
+		return self.outputIndex().series(selector, modelId, outputId, partitionId)
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""
+Offline OEE backfill: recalculates the results of the Oee block over months of recorded events with NumPy.
+"""
+from oeebackfill.engine import BackfillEngine, backfill, path_for, input_codes, concat_results, INPUTS, PATHS, KPIS, COLUMNS
+from oeebackfill.calendar import ShiftCalendar
+from oeebackfill.io import read_csv, read_jsonl, write_csv, write_jsonl
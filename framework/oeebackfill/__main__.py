@@ -0,0 +1,43 @@
+"""
+Recalculates OEE from recorded events, e.g.
+
+    python -m oeebackfill --interval 3600 --ica 100 --path 1 events.csv -o oee.csv
+"""
+import argparse, sys, time
+
+from oeebackfill.engine import BackfillEngine
+from oeebackfill.io import DEFAULT_CHUNK_SIZE, read_csv, read_jsonl, write_csv, write_jsonl
+
+def main(args=None):
+	parser = argparse.ArgumentParser(prog='oeebackfill', description='Recalculates OEE from recorded Oee block inputs.')
+	parser.add_argument('input', help='CSV (time,input,value) or JSON Lines file with the events in time order')
+	parser.add_argument('-o', '--output', help='file to write the results to, standard output if not given')
+	parser.add_argument('--interval', type=float, required=True, help='the Interval parameter of the block')
+	parser.add_argument('--ica', type=float, required=True, help='the Ideal Cycle Amount parameter of the block')
+	parser.add_argument('--path', type=int, required=True, choices=[1, 2, 3, 4], 
+		help='calculation path: 1 amount + amount_ok, 2 amount + qok, 3 amount_ok + amount_nok, 4 amount + amount_nok')
+	parser.add_argument('--shift-plan', default='', help='the Shift Plan parameter of the block, e.g. "Mon-Fri 06:00-14:00"')
+	parser.add_argument('--format', choices=['csv', 'json'], help='input and output format, derived from the input file name if not given')
+	parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='number of events processed at a time')
+	parser.add_argument('--finish', action='store_true', help='also process the events of the last timestamp')
+	args = parser.parse_args(args)
+
+	fmt = args.format or ('json' if args.input.endswith(('.json', '.jsonl')) else 'csv')
+	read, write = (read_jsonl, write_jsonl) if fmt == 'json' else (read_csv, write_csv)
+	engine = BackfillEngine(args.interval, args.ica, args.path, args.shift_plan)
+	stats = {'events': 0}
+
+	def results():
+		for times, inputs, values in read(args.input, args.chunk_size):
+			stats['events'] += len(times)
+			yield engine.feed(times, inputs, values)
+		if args.finish:
+			yield engine.finish()
+
+	start = time.time()
+	write(args.output or sys.stdout, results())
+	elapsed = time.time() - start
+	print(f"Processed {stats['events']} events in {elapsed:.2f}s", file=sys.stderr)
+
+if __name__ == '__main__':
+	main()
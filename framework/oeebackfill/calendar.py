@@ -0,0 +1,144 @@
+"""
+Shift plans as in src/eventdefinitions/ShiftCalendar.mon, with the planned time calculated for arrays of times.
+"""
+import datetime
+import numpy as np
+
+DAY = 86400.0
+WEEK = 604800.0
+# 1970-01-01 was a Thursday, weeks start on Monday
+WEEK_OFFSET = 259200.0
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+class _PlannedRanges:
+	"""Sorted boundaries alternating between range start and end, with the planned time up to each boundary."""
+
+	def __init__(self, starts, ends):
+		bounds, planned, total = [], [], 0.0
+		for start, end in sorted(zip(starts, ends)):
+			if bounds and start <= bounds[-1]:
+				if end > bounds[-1]:
+					total += end - bounds[-1]
+					bounds[-1] = end
+					planned[-1] = total
+			elif end > start:
+				bounds += [start, end]
+				planned += [total, total + end - start]
+				total += end - start
+		self.bounds = np.array(bounds)
+		self.planned = np.array(planned)
+		self.total = total
+
+	def planned_until(self, offset):
+		i = np.searchsorted(self.bounds, offset, side='right')
+		if len(self.bounds) == 0:
+			return np.zeros_like(offset)
+		k = np.maximum(i - 1, 0)
+		inside = (i % 2) == 1
+		return np.where(i == 0, 0.0, self.planned[k] + np.where(inside, offset - self.bounds[k], 0.0))
+
+
+def _parse_time(time):
+	try:
+		hours, minutes = (int(p) for p in time.strip().split(':'))
+	except ValueError:
+		hours = minutes = -1
+	if hours >= 0 and 0 <= minutes < 60 and (hours < 24 or (hours == 24 and minutes == 0)):
+		return float(hours * 3600 + minutes * 60)
+	raise ValueError(f"Invalid shift time '{time}', expected HH:MM")
+
+def _add_ranges(ranges, offset, overMidnight, starts, ends):
+	if ranges.lower() == 'off':
+		return
+	for r in ranges.split(','):
+		times = r.strip().split('-')
+		if len(times) != 2:
+			raise ValueError(f"Invalid shift time range '{r}', expected HH:MM-HH:MM")
+		start, end = _parse_time(times[0]), _parse_time(times[1])
+		if end <= start:
+			if not overMidnight:
+				raise ValueError(f"Shift time range '{r}' of an exception day must not run over midnight")
+			end += DAY
+		starts.append(offset + start)
+		ends.append(offset + end)
+
+def _weekday(day):
+	day = day.strip().lower()
+	if day not in WEEKDAYS:
+		raise ValueError(f"Invalid weekday '{day}', expected Mon, Tue, Wed, Thu, Fri, Sat or Sun")
+	return WEEKDAYS.index(day)
+
+
+class ShiftCalendar:
+	"""A weekly shift plan with exception days, see the Shift Plan parameter of the block. An empty plan means always planned."""
+
+	def __init__(self, plan=''):
+		self.always = (plan or '').strip() == ''
+		weekStarts, weekEnds, exceptions = [], [], {}
+		for entry in (plan or '').split(';'):
+			entry = entry.strip()
+			if not entry:
+				continue
+			if ' ' not in entry:
+				raise ValueError(f"Invalid shift plan entry '{entry}', expected a day followed by time ranges or 'off'")
+			day, ranges = entry.split(' ', 1)
+			ranges = ranges.strip()
+			if len(day) == 10 and day[4] == '-':
+				date = datetime.datetime.strptime(day, '%Y-%m-%d').replace(tzinfo=datetime.timezone.utc)
+				exceptions[date.timestamp()] = ranges
+				continue
+			first, last = (_weekday(d) for d in day.split('-')) if '-' in day else (_weekday(day),) * 2
+			d = first
+			while True:
+				_add_ranges(ranges, d * DAY, True, weekStarts, weekEnds)
+				if d == last:
+					break
+				d = (d + 1) % 7
+		# ranges running over the end of the week continue at its start
+		for i in range(len(weekStarts)):
+			if weekEnds[i] > WEEK:
+				weekStarts.append(0.0)
+				weekEnds.append(weekEnds[i] - WEEK)
+				weekEnds[i] = WEEK
+		self.week = _PlannedRanges(weekStarts, weekEnds)
+
+		self.exceptionDays = np.array(sorted(exceptions))
+		self.exceptions = []
+		corrections = [0.0]
+		for dayStart in self.exceptionDays:
+			starts, ends = [], []
+			_add_ranges(exceptions[dayStart], 0.0, False, starts, ends)
+			ranges = _PlannedRanges(starts, ends)
+			self.exceptions.append(ranges)
+			weekly = self._weekly_planned_until(np.array([dayStart + DAY, dayStart]))
+			corrections.append(corrections[-1] + ranges.total - (weekly[0] - weekly[1]))
+		self.corrections = np.array(corrections)
+
+	def planned_between(self, start, end):
+		"""Planned time between start and end, for arrays of times."""
+		start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+		if self.always:
+			return end - start
+		return self.planned_until(end) - self.planned_until(start)
+
+	def planned_until(self, time):
+		"""Planned time from the epoch up to time."""
+		time = np.asarray(time, dtype=float)
+		planned = self._weekly_planned_until(time)
+		lo = np.searchsorted(self.exceptionDays, time, side='right')
+		result = planned + self.corrections[lo]
+		if len(self.exceptions):
+			k = np.maximum(lo - 1, 0)
+			dayStart = self.exceptionDays[k]
+			within = (lo > 0) & (time < dayStart + DAY)
+			for i in np.unique(k[within]):
+				# within an exception day, which replaces the weekly plan up to time
+				m = within & (k == i)
+				result[m] = (self._weekly_planned_until(dayStart[m]) + self.corrections[i]
+					+ self.exceptions[i].planned_until(time[m] - dayStart[m]))
+		return result
+
+	def _weekly_planned_until(self, time):
+		sinceMonday = time + WEEK_OFFSET
+		weeks = np.floor(sinceMonday / WEEK)
+		return weeks * self.week.total + self.week.planned_until(sinceMonday - weeks * WEEK)
@@ -0,0 +1,439 @@
+"""
+Calculates OEE offline over NumPy arrays with the same semantics as the Oee block in src/blocks/oee/oee.mon.
+
+Events are (time, input, value) triples, input being one of INPUTS and booleans given as 1.0 / 0.0. As in 
+Analytics Builder, all events with the same time form one activation of the block and the latest value of an 
+input stays in effect until the next event for it. Events must be fed in time order, a chunk at a time.
+
+Differences to the block:
+ * The status history limit is not applied, i.e. it behaves as if statusHistoryLimit is 0.
+ * Results are produced per interval, there is no output queue or catch-up delay.
+"""
+import numpy as np
+
+from oeebackfill.calendar import ShiftCalendar
+
+STATUS, AMOUNT, AMOUNT_OK, AMOUNT_NOK, QOK = range(5)
+INPUTS = ('status', 'amount', 'amount_ok', 'amount_nok', 'qok')
+
+# inputs that need to be connected for each calculation path, see Oee.path()
+PATHS = {
+	1: (STATUS, AMOUNT, AMOUNT_OK),
+	2: (STATUS, AMOUNT, QOK),
+	3: (STATUS, AMOUNT_OK, AMOUNT_NOK),
+	4: (STATUS, AMOUNT, AMOUNT_NOK),
+}
+
+# names of the details properties, as in OEEEventDefinitions.mon
+KPIS = ('OEE', 'Availability', 'Performance', 'Quality',
+	'ActualProductionTime', 'ActualProductionAmount', 'ActualQualityAmount',
+	'IdealAmount', 'IdealCycleTime', 'IdealQualityTime', 'IdealMachineRuntime',
+	'QualityLossAmount', 'AvailabilityLossAmount', 'PerformanceLossAmount',
+	'PerformanceLossTime', 'QualityLossTime', 'AvailabilityLossTime')
+COLUMNS = ('time',) + KPIS
+
+DECIMAL_PRECISION = 4
+
+def path_for(inputs):
+	"""Returns the calculation path for the connected inputs (names or codes), 0 if the combination is not supported."""
+	connected = set(INPUTS.index(i) if isinstance(i, str) else i for i in inputs)
+	for path, required in PATHS.items():
+		if connected == set(required):
+			return path
+	return 0
+
+def input_codes(inputs):
+	"""Converts an array of input names to input codes."""
+	names, index = np.unique(np.asarray(inputs, dtype=str), return_inverse=True)
+	unknown = [n for n in names if n not in INPUTS]
+	if unknown:
+		raise ValueError(f'Unknown inputs: {unknown}')
+	return np.array([INPUTS.index(n) for n in names], dtype=np.int8)[index]
+
+def empty_results():
+	return {c: np.empty(0) for c in COLUMNS}
+
+def concat_results(results):
+	results = list(results)
+	if not results:
+		return empty_results()
+	return {c: np.concatenate([r[c] for r in results]) for c in COLUMNS}
+
+def round_half_away(x, precision=DECIMAL_PRECISION):
+	"""Rounds like Util.round: halves away from zero, non-finite values unchanged."""
+	scale = 10.0 ** precision
+	with np.errstate(invalid='ignore', over='ignore'):
+		scaled = np.abs(x) * scale
+		rounded = np.floor(scaled)
+		rounded += (scaled - rounded) >= 0.5
+		return np.where(np.isfinite(scaled), np.copysign(rounded, x) / scale, x)
+
+
+class _Grid:
+	"""The intervals of CurrentInterval: interval k starts at base + interval * k."""
+
+	def __init__(self, base, interval):
+		self.base = base
+		self.interval = interval
+
+	def start(self, k):
+		return self.base + self.interval * np.asarray(k, dtype=float)
+
+	def end(self, k):
+		return self.start(k) + self.interval
+
+	def index(self, t):
+		"""Index of the interval containing each time."""
+		t = np.asarray(t, dtype=float)
+		k = np.floor((t - self.base) / self.interval).astype(np.int64)
+		k -= self.start(k) > t
+		k += self.end(k) <= t
+		return k
+
+
+class _History:
+	"""
+	Step function of a boolean status with the running time in state true, like StatusHistory.
+	Only changes are kept.
+	"""
+
+	def __init__(self, time, state):
+		self.times = np.array([time], dtype=float)
+		self.states = np.array([state], dtype=bool)
+		self.ups = np.zeros(1)
+
+	def extend(self, times, states):
+		"""Adds the states at the given times, which must be ordered and after the last change."""
+		states = np.asarray(states, dtype=bool)
+		changed = states != np.concatenate((self.states[-1:], states[:-1]))
+		times, states = np.asarray(times, dtype=float)[changed], states[changed]
+		if len(times) == 0:
+			return
+		allTimes = np.concatenate((self.times[-1:], times))
+		allStates = np.concatenate((self.states[-1:], states))
+		ups = self.ups[-1] + np.cumsum(np.diff(allTimes) * allStates[:-1])
+		self.times = np.concatenate((self.times, times))
+		self.states = np.concatenate((self.states, states))
+		self.ups = np.concatenate((self.ups, ups))
+
+	def _at(self, x):
+		return np.maximum(np.searchsorted(self.times, x, side='right') - 1, 0)
+
+	def state_at(self, x):
+		return self.states[self._at(x)]
+
+	def up_until(self, x):
+		"""Time spent in state true up to x, counted from the oldest retained change."""
+		i = self._at(x)
+		return self.ups[i] + (x - self.times[i]) * self.states[i]
+
+	def planned_up_until(self, x, calendar):
+		"""Planned time spent in state true up to x, counted from the oldest retained change."""
+		planned = np.concatenate(([0.0], np.cumsum(calendar.planned_between(self.times[:-1], self.times[1:]) * self.states[:-1])))
+		i = self._at(x)
+		return planned[i] + calendar.planned_between(self.times[i], x) * self.states[i]
+
+	def prune(self, before):
+		"""Drops the changes that are superseded by a later change at or before the given time."""
+		i = int(self._at(before))
+		if i > 0:
+			self.times, self.states, self.ups = self.times[i:], self.states[i:], self.ups[i:]
+
+
+class _Amounts:
+	"""
+	Sums an amount input per interval like StatefulExpressionParser, including the availability weighted split
+	of ExpressionParser.split for amounts that arrive after the end of the interval of the previous amount.
+	"""
+
+	def __init__(self, grid):
+		self.grid = grid
+		self.last = grid.base
+		self.current = 0
+		self.pending = 0.0
+		self.pendingOk = 0.0
+
+	def apply(self, times, amounts, status, quality=None):
+		"""
+		Applies the amounts and returns the totals of the intervals that completed (and, given the quality
+		indicator, the totals of the amounts received while quality was ok) together with the first interval.
+		"""
+		first = self.current
+		if len(times) == 0:
+			return first, np.empty(0), np.empty(0)
+		grid = self.grid
+		# Util.sum ignores infinite amounts
+		amounts = np.where(amounts == np.inf, 0.0, amounts)
+		k = grid.index(times)
+		prevTimes = np.concatenate(([self.last], times[:-1]))
+		prevK = np.concatenate(([self.current], k[:-1]))
+		# amounts in the interval of the previous amount, or exactly at its end, are not split
+		whole = (k == prevK) | ((k == prevK + 1) & (times == grid.end(prevK)))
+		counts = np.where(whole, 1, k - prevK + 1)
+
+		row = np.repeat(np.arange(len(times)), counts)
+		offset = np.arange(len(row)) - np.repeat(np.cumsum(counts) - counts, counts)
+		j = prevK[row] + offset
+		t = times[row]
+		p = prevTimes[row]
+		isLast = offset == counts[row] - 1
+		lo = np.maximum(grid.start(j), p)
+		hi = np.minimum(grid.end(j), t)
+		affected = status.up_until(t) - status.up_until(p)
+		with np.errstate(divide='ignore', invalid='ignore'):
+			weight = np.where(affected == 0.0, 0.0, (status.up_until(hi) - status.up_until(lo)) / affected)
+		splitRow = ~whole[row]
+		value = np.where(splitRow, amounts[row] * weight, amounts[row])
+		# amounts of earlier intervals are recorded at the interval end, see AmountByQualityState.add
+		recorded = np.where(splitRow & ~isLast, grid.end(j), t)
+
+		size = k[-1] - first + 1
+		totals = np.bincount(np.concatenate(([0], j - first)), np.concatenate(([self.pending], value)), minlength=size)
+		okTotals = np.empty(0)
+		if quality is not None:
+			okValue = value * quality.state_at(recorded)
+			okTotals = np.bincount(np.concatenate(([0], j - first)), np.concatenate(([self.pendingOk], okValue)), minlength=size)
+			self.pendingOk = okTotals[-1]
+			okTotals = okTotals[:-1]
+		self.pending = totals[-1]
+		self.current = int(k[-1])
+		self.last = times[-1]
+		return first, totals[:-1], okTotals
+
+
+class BackfillEngine:
+	"""
+	Calculates the OEE results of one model. Feed events chunk by chunk with feed(), each call returns the
+	results of the intervals that completed, call finish() after the last chunk.
+	"""
+
+	def __init__(self, interval, ica, path, shiftPlan=''):
+		if path not in PATHS:
+			raise ValueError(f'Unsupported calculation path {path}')
+		self.interval = float(interval)
+		self.ica = float(ica)
+		self.path = path
+		self.calendar = ShiftCalendar(shiftPlan)
+		self.grid = None
+		self.statusSince = None
+		self.qokSince = None
+		self.lastTime = None
+		self.held = (np.empty(0), np.empty(0, dtype=np.int8), np.empty(0))
+		self.nextApt = 0
+		# results per component not yet joined, as (first interval, values)
+		self.components = {}
+
+	def feed(self, times, inputs, values):
+		"""Processes a chunk of events, inputs given as names or codes. Events at the last time of the chunk are
+		held back until the next chunk as more events of that activation may follow."""
+		times = np.asarray(times, dtype=float)
+		inputs = np.asarray(inputs)
+		if inputs.dtype.kind in 'US':
+			inputs = input_codes(inputs)
+		values = np.asarray(values, dtype=float)
+		times = np.concatenate((self.held[0], times))
+		inputs = np.concatenate((self.held[1], inputs.astype(np.int8)))
+		values = np.concatenate((self.held[2], values))
+		if len(times) == 0:
+			return empty_results()
+		order = np.argsort(times, kind='stable')
+		times, inputs, values = times[order], inputs[order], values[order]
+		cut = np.searchsorted(times, times[-1], side='left')
+		self.held = (times[cut:], inputs[cut:], values[cut:])
+		return self._process(times[:cut], inputs[:cut], values[:cut])
+
+	def finish(self):
+		"""Processes the held back events. The block only processes the last activation once time moves on, so
+		leave this out to get the results the block outputs for the same events."""
+		times, inputs, values = self.held
+		self.held = (np.empty(0), np.empty(0, dtype=np.int8), np.empty(0))
+		return self._process(times, inputs, values)
+
+	def _events(self, times, inputs, values, code):
+		"""The events of one input; of several events at the same time only the last is in effect."""
+		mask = inputs == code
+		t, v = times[mask], values[mask]
+		keep = np.ones(len(t), dtype=bool)
+		keep[:-1] = t[1:] != t[:-1]
+		return t[keep], v[keep]
+
+	def _process(self, times, inputs, values):
+		if len(times) == 0:
+			return empty_results()
+		if self.lastTime is not None and times[0] < self.lastTime:
+			raise ValueError(f'Events must be in time order, {times[0]} is before {self.lastTime}')
+		self.lastTime = times[-1]
+		if self.grid is None:
+			# the first activation sets up the calculation, even if the block cannot process it yet
+			self.grid = _Grid(times[0], self.interval)
+			self.status = _History(times[0], True)
+			self.quality = _History(times[0], True)
+			self.amounts = {code: _Amounts(self.grid) for code in PATHS[self.path][1:] if code != QOK}
+			if self.path == 2:
+				self.components = {'apt': (0, np.empty(0)), AMOUNT: (0, np.empty(0)), QOK: (0, np.empty(0))}
+			else:
+				self.components = {'apt': (0, np.empty(0))}
+				self.components.update({code: (0, np.empty(0)) for code in self.amounts})
+
+		statusTimes, statusValues = self._events(times, inputs, values, STATUS)
+		if self.statusSince is None and len(statusTimes):
+			self.statusSince = statusTimes[0]
+		if self.statusSince is None:
+			# the block fails every activation until the machine status is known
+			return empty_results()
+		self.status.extend(statusTimes, statusValues != 0)
+		qokTimes, qokValues = self._events(times, inputs, values, QOK)
+		if self.qokSince is None and len(qokTimes):
+			self.qokSince = qokTimes[0]
+		self.quality.extend(qokTimes, qokValues != 0)
+
+		# machine status is evaluated on every activation, completing the intervals that ended
+		last = times[-1]
+		if last >= self.statusSince:
+			upTo = int(self.grid.index(last))
+			if upTo > self.nextApt:
+				k = np.arange(self.nextApt, upTo)
+				if self.calendar.always:
+					apt = self.status.up_until(self.grid.end(k)) - self.status.up_until(self.grid.start(k))
+				else:
+					# the machine only counts as producing during planned time
+					apt = (self.status.planned_up_until(self.grid.end(k), self.calendar)
+						- self.status.planned_up_until(self.grid.start(k), self.calendar))
+				self._add('apt', self.nextApt, apt)
+				self.nextApt = upTo
+
+		# amounts are only processed once the machine status (and on path 2 the quality indicator) is known
+		since = self.statusSince
+		if self.path == 2:
+			since = np.inf if self.qokSince is None else max(since, self.qokSince)
+		for code, amounts in self.amounts.items():
+			t, v = self._events(times, inputs, values, code)
+			keep = t >= since
+			quality = self.quality if self.path == 2 else None
+			first, totals, okTotals = amounts.apply(t[keep], v[keep], self.status, quality)
+			self._add(code, first, totals)
+			if quality is not None:
+				self._add(QOK, first, okTotals)
+
+		oldest = min([a.last for a in self.amounts.values()] + [float(self.grid.start(self.nextApt))])
+		self.status.prune(oldest)
+		self.quality.prune(oldest)
+		return self._join()
+
+	def _add(self, component, first, values):
+		start, pending = self.components[component]
+		if len(values) == 0:
+			return
+		assert first == start + len(pending), 'results must be contiguous'
+		self.components[component] = (start, np.concatenate((pending, values)))
+
+	def _join(self):
+		"""Calculates the results of the intervals for which all three components are available."""
+		start = min(s for s, _ in self.components.values())
+		upTo = min(s + len(v) for s, v in self.components.values())
+		if upTo <= start:
+			return empty_results()
+		parts = {}
+		for component, (s, v) in self.components.items():
+			parts[component] = v[start - s:upTo - s]
+			self.components[component] = (upTo, v[upTo - s:])
+		time = self.grid.end(np.arange(start, upTo))
+		# intervals without planned time are not output
+		ppt = self.calendar.planned_between(time - self.interval, time)
+		planned = ppt > 0.0
+		time, ppt = time[planned], ppt[planned]
+		parts = {component: v[planned] for component, v in parts.items()}
+		apt = parts['apt']
+		if self.path == 1:
+			result = self._calculate_apt_apa_aqa(ppt, apt, parts[AMOUNT], parts[AMOUNT_OK])
+		elif self.path == 2:
+			result = self._calculate_apt_apa_aqa(ppt, apt, parts[AMOUNT], parts[QOK])
+		elif self.path == 3:
+			result = self._calculate_apt_aqa_qla(ppt, apt, parts[AMOUNT_OK], parts[AMOUNT_NOK])
+		else:
+			result = self._calculate_apt_apa_qla(ppt, apt, parts[AMOUNT], parts[AMOUNT_NOK])
+		result = {name: round_half_away(np.broadcast_to(np.asarray(value, dtype=float), apt.shape)) for name, value in result.items()}
+		result['time'] = time
+		return {c: result[c] for c in COLUMNS}
+
+	def _ratios(self, actualProductionTime, actualProductionAmount, actualQualityAmount, idealMachineRuntime, potentialProductionTime):
+		with np.errstate(divide='ignore', invalid='ignore'):
+			availability = np.where(potentialProductionTime > 0.0, actualProductionTime / potentialProductionTime, 0.0)
+			performance = np.where(actualProductionTime > 0.0, idealMachineRuntime / actualProductionTime, 0.0)
+			quality = np.where(actualProductionAmount > 0.0, actualQualityAmount / actualProductionAmount, 0.0)
+		return availability, performance, quality
+
+	def _calculate_apt_apa_aqa(self, potentialProductionTime, actualProductionTime, actualProductionAmount, actualQualityAmount):
+		"""See Oee.performOEECalculation_APT_APA_AQA."""
+		idealCycleAmount = self.ica
+		cycleLength = self.interval
+		with np.errstate(divide='ignore', invalid='ignore'):
+			idealCycleTime = cycleLength / idealCycleAmount
+			idealAmount = (potentialProductionTime / cycleLength) * idealCycleAmount
+			idealProductionAmount = (actualProductionTime / cycleLength) * idealCycleAmount
+			idealQualityTime = (actualQualityAmount / idealCycleAmount) * cycleLength
+			idealMachineRuntime = (actualProductionAmount / idealCycleAmount) * cycleLength
+			qualityLossAmount = actualProductionAmount - actualQualityAmount
+			availabilityLossAmount = idealAmount - idealProductionAmount
+			performanceLossAmount = idealProductionAmount - actualProductionAmount
+			performanceLossTime = actualProductionTime - idealMachineRuntime
+			qualityLossTime = (qualityLossAmount / idealCycleAmount) * cycleLength
+			availabilityLossTime = (availabilityLossAmount / idealCycleAmount) * cycleLength
+		availability, performance, quality = self._ratios(actualProductionTime, actualProductionAmount, actualQualityAmount, idealMachineRuntime, potentialProductionTime)
+		return self._result(locals())
+
+	def _calculate_apt_aqa_qla(self, potentialProductionTime, actualProductionTime, actualQualityAmount, qualityLossAmount):
+		"""See Oee.performOEECalculation_APT_AQA_QLA."""
+		idealCycleAmount = self.ica
+		cycleLength = self.interval
+		with np.errstate(divide='ignore', invalid='ignore'):
+			idealCycleTime = cycleLength / idealCycleAmount
+			availabilityLossTime = potentialProductionTime - actualProductionTime
+			idealAmount = (potentialProductionTime / cycleLength) * idealCycleAmount
+			idealProductionAmount = (actualProductionTime / cycleLength) * idealCycleAmount
+			idealQualityTime = (actualQualityAmount / idealCycleAmount) * cycleLength
+			qualityLossTime = (qualityLossAmount / idealCycleAmount) * cycleLength
+			actualProductionAmount = actualQualityAmount + qualityLossAmount
+			availabilityLossAmount = (availabilityLossTime * idealCycleAmount) / cycleLength
+			idealMachineRuntime = (actualProductionAmount / idealCycleAmount) * cycleLength
+			performanceLossAmount = idealProductionAmount - actualProductionAmount
+			performanceLossTime = ((performanceLossAmount / idealCycleAmount) * cycleLength)
+		availability, performance, quality = self._ratios(actualProductionTime, actualProductionAmount, actualQualityAmount, idealMachineRuntime, potentialProductionTime)
+		return self._result(locals())
+
+	def _calculate_apt_apa_qla(self, potentialProductionTime, actualProductionTime, actualProductionAmount, qualityLossAmount):
+		"""See Oee.performOEECalculation_APT_APA_QLA."""
+		idealCycleAmount = self.ica
+		cycleLength = self.interval
+		with np.errstate(divide='ignore', invalid='ignore'):
+			idealCycleTime = cycleLength / idealCycleAmount
+			idealAmount = (potentialProductionTime / cycleLength) * idealCycleAmount
+			idealProductionAmount = (actualProductionTime / cycleLength) * idealCycleAmount
+			idealMachineRuntime = (actualProductionAmount / idealCycleAmount) * cycleLength
+			actualQualityAmount = actualProductionAmount - qualityLossAmount
+			qualityLossTime = (qualityLossAmount / idealCycleAmount) * cycleLength
+			availabilityLossAmount = idealAmount - idealProductionAmount
+			performanceLossAmount = idealProductionAmount - actualProductionAmount
+			idealQualityTime = (actualQualityAmount / idealCycleAmount) * cycleLength
+			availabilityLossTime = (availabilityLossAmount / idealCycleAmount) * cycleLength
+			performanceLossTime = ((performanceLossAmount / idealCycleAmount) * cycleLength)
+		availability, performance, quality = self._ratios(actualProductionTime, actualProductionAmount, actualQualityAmount, idealMachineRuntime, potentialProductionTime)
+		return self._result(locals())
+
+	def _result(self, values):
+		oee = values['availability'] * values['performance'] * values['quality']
+		names = {name: name[0].lower() + name[1:] for name in KPIS}
+		names['OEE'] = 'oee'
+		values = dict(values, oee=oee)
+		return {name: values[local] for name, local in names.items()}
+
+
+def backfill(times, inputs, values, interval, ica, path=None, shiftPlan=''):
+	"""Calculates the OEE results for all events at once. The path is derived from the inputs if not given."""
+	inputs = np.asarray(inputs)
+	if inputs.dtype.kind in 'US':
+		inputs = input_codes(inputs)
+	if path is None:
+		path = path_for(np.unique(inputs))
+	engine = BackfillEngine(interval, ica, path, shiftPlan)
+	return concat_results([engine.feed(times, inputs, values), engine.finish()])
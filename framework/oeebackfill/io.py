@@ -0,0 +1,75 @@
+"""
+Chunked reading and writing of events and results.
+
+Events are read from CSV files with the columns time, input and value or from JSON Lines files with one
+{"time": ..., "input": ..., "value": ...} object per line. Inputs are named as in INPUTS, values are numbers or
+true / false.
+"""
+import csv, itertools, json
+import numpy as np
+
+from oeebackfill.engine import COLUMNS, input_codes
+
+DEFAULT_CHUNK_SIZE = 1000000
+
+def _open(source, mode='r'):
+	if hasattr(source, 'read') or hasattr(source, 'write'):
+		return _Unclosed(source)
+	return open(source, mode, newline='')
+
+class _Unclosed:
+	def __init__(self, f):
+		self.f = f
+	def __enter__(self):
+		return self.f
+	def __exit__(self, *args):
+		pass
+
+def _parse_values(values):
+	"""Converts value strings (numbers, true / false) to floats."""
+	unique, index = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+	parsed = np.array([{'true': 1.0, 'false': 0.0}.get(u.strip().lower()) if u.strip().lower() in ('true', 'false') else float(u) for u in unique])
+	return parsed[index]
+
+def read_csv(source, chunkSize=DEFAULT_CHUNK_SIZE):
+	"""Yields (times, inputs, values) arrays of up to chunkSize events."""
+	with _open(source) as f:
+		reader = csv.reader(f)
+		header = [h.strip() for h in next(reader)]
+		columns = [header.index(c) for c in ('time', 'input', 'value')]
+		while True:
+			rows = list(itertools.islice(reader, chunkSize))
+			if not rows:
+				return
+			fields = list(zip(*rows))
+			times, inputs, values = (fields[c] for c in columns)
+			yield np.array(times, dtype=float), input_codes(inputs), _parse_values(values)
+
+def read_jsonl(source, chunkSize=DEFAULT_CHUNK_SIZE):
+	"""Yields (times, inputs, values) arrays of up to chunkSize events."""
+	with _open(source) as f:
+		lines = (line for line in f if line.strip())
+		while True:
+			events = [json.loads(line) for line in itertools.islice(lines, chunkSize)]
+			if not events:
+				return
+			yield (np.array([e['time'] for e in events], dtype=float), 
+				input_codes([e['input'] for e in events]), 
+				np.array([float(e['value']) for e in events]))
+
+def write_csv(target, chunks, header=True):
+	"""Writes result chunks as CSV, one row per interval."""
+	with _open(target, 'w') as f:
+		if header:
+			f.write(','.join(COLUMNS) + '\n')
+		for results in chunks:
+			if len(results['time']):
+				np.savetxt(f, np.column_stack([results[c] for c in COLUMNS]), delimiter=',', fmt='%.10g')
+
+def write_jsonl(target, chunks):
+	"""Writes result chunks as JSON Lines, one object per interval."""
+	with _open(target, 'w') as f:
+		for results in chunks:
+			columns = [results[c].tolist() for c in COLUMNS]
+			for row in zip(*columns):
+				f.write(json.dumps(dict(zip(COLUMNS, row))) + '\n')
@@ -0,0 +1,64 @@
+__pysys_title__   = r""" Category Backfill - The offline backfill engine recalculates the results of the block """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" A generated day of events with status changes, amounts split across intervals, quality changes and an 
+	outage is sent to one model per calculation path. The details output of every model matches the results 
+	of the backfill engine in framework/oeebackfill for the same events. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+import random
+
+class PySysTest(OeeBaseTest):
+
+	INTERVAL = 300.0
+	ICA = 100.0
+	END = 86400
+
+	PATHS = [
+		{'status':'boolean', 'amount':'float', 'amount_ok':'float', 'amount_nok':None, 'qok':None},
+		{'status':'boolean', 'amount':'float', 'amount_ok':None, 'amount_nok':None, 'qok':'boolean'},
+		{'status':'boolean', 'amount':None, 'amount_ok':'float', 'amount_nok':'float', 'qok':None},
+		{'status':'boolean', 'amount':'float', 'amount_ok':None, 'amount_nok':'float', 'qok':None},
+	]
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.models = [self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=inputs,
+								 parameters={'0:interval':self.INTERVAL,'0:ica':self.ICA,'0:catchUpDelay':0.0}) for inputs in self.PATHS]
+		events = []
+		rand = random.Random(11)
+		t = 30
+		status = True
+		qok = True
+		while t < self.END:
+			events.append(self.timestamp(t))
+			if t == 30 or rand.random() < 0.1:
+				status = t == 30 or not status
+				qok = t == 30 or rand.random() < 0.8
+				for modelId in self.models:
+					events.append(self.inputEvent('status', status, id=modelId))
+				events.append(self.inputEvent('qok', qok, id=self.models[1]))
+			if status or rand.random() < 0.2:
+				amount = rand.randint(0, 15)
+				nok = rand.randint(0, 2)
+				events += [
+					self.inputEvent('amount', amount, id=self.models[0]),
+					self.inputEvent('amount_ok', amount - nok, id=self.models[0]),
+					self.inputEvent('amount', amount, id=self.models[1]),
+					self.inputEvent('amount_ok', amount - nok, id=self.models[2]),
+					self.inputEvent('amount_nok', nok, id=self.models[2]),
+					self.inputEvent('amount', amount, id=self.models[3]),
+					self.inputEvent('amount_nok', nok, id=self.models[3]),
+				]
+			# an outage of 2 hours, the amount of the first events after it is split across all missed intervals
+			t += 7200 if 40000 < t < 40200 else rand.randint(1, 180)
+		events.append(self.timestamp(self.END + 1))
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+
+	def validate(self):
+		for modelId in self.models:
+			self.assertThat('len(outputs) > 250', outputs=self.details('OEE', modelId))
+			self.assertMatchesBackfill(self.INTERVAL, self.ICA, modelId)
@@ -0,0 +1,40 @@
+__pysys_title__   = r""" Category Catch-up - Intervals missed during an outage are output as one batch """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" After a device reconnects from a 3 hour outage all 180 missed intervals are calculated in one pass. 
+	With a catch-up delay of 0 they are all output within a second of the reconnect. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	INTERVAL = 60.0
+	MISSED = 180
+    
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', 
+								 inputs={'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None},
+								 parameters={'0:interval':self.INTERVAL,'0:ica':10.0,'0:catchUpDelay':0.0})
+		reconnect = 30 + self.INTERVAL * self.MISSED
+		self.sendEventStrings(correlator,
+							  self.timestamp(30),
+							  self.inputEvent('status', True, id=modelId),
+							  self.inputEvent('amount', 0, id=modelId),
+							  self.inputEvent('amount_ok', 0, id=modelId),
+							  self.timestamp(reconnect),
+							  self.inputEvent('status', True, id=modelId),
+							  self.inputEvent('amount', self.MISSED, id=modelId),
+							  self.inputEvent('amount_ok', self.MISSED, id=modelId),
+							  self.timestamp(reconnect + 1),
+							  )
+		correlator.flush()
+
+	def validate(self):
+		self.assertBlockOutput('timestamp', [90.0 + self.INTERVAL * i for i in range(self.MISSED)])
+		self.assertBlockOutput('availability', [1.0] * self.MISSED)
+		self.assertBlockOutput('performance', [0.1] * self.MISSED)
+		self.assertBlockOutput('quality', [1.0] * self.MISSED)
+		self.assertBlockOutput('oee', [0.1] * self.MISSED)
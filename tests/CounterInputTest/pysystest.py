@@ -0,0 +1,49 @@
+__pysys_title__   = r""" Category Amount - Cumulative counters as amount inputs, with a rollover and a reset """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" One model receives the amounts since the previous input, the other the readings of cumulative 
+	counters for the same amounts. The amount counter rolls over at 1000 early on, and both counters are reset to 
+	0 later. The first reading of a counter counts as no amount. The results of both models are the same. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	INPUTS = {'status':'boolean', 'amount':'float', 'amount_ok':'float', 'amount_nok':None, 'qok':None}
+	RESET = 250
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.amounts = self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.INPUTS,
+								 parameters={'0:interval':60.0,'0:ica':30.0})
+		self.counters = self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.INPUTS,
+								 parameters={'0:interval':60.0,'0:ica':30.0,'0:amountCounter':True,'0:amountOkCounter':True,'0:counterRollover':1000.0})
+		counter, okCounter = 985, 0
+		events = []
+		for i, t in enumerate(range(30, 400, 10)):
+			amount = 0 if i == 0 else 2 + i % 2
+			ok = max(amount - 1, 0)
+			if t == self.RESET:
+				counter, okCounter = amount, ok
+			else:
+				counter, okCounter = (counter + amount) % 1000, okCounter + ok
+			events.append(self.timestamp(t))
+			if i == 0 or t in (130, 170):
+				status = t != 130
+				events += [self.inputEvent('status', status, id=self.amounts), self.inputEvent('status', status, id=self.counters)]
+			events += [self.inputEvent('amount', amount, id=self.amounts), self.inputEvent('amount_ok', ok, id=self.amounts),
+					   self.inputEvent('amount', counter, id=self.counters), self.inputEvent('amount_ok', okCounter, id=self.counters)]
+		events.append(self.timestamp(400))
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+
+	def validate(self):
+		timestamps = self.outputsByModel('timestamp')
+		self.assertThat('len(counters) == len(amounts) > 4', counters=timestamps[self.counters], amounts=timestamps[self.amounts])
+		for kpi in ['OEE', 'Availability', 'Performance', 'Quality', 'ActualProductionAmount', 'ActualQualityAmount']:
+			expected = self.details(kpi, self.amounts)
+			actual = self.details(kpi, self.counters)
+			self.assertThat('len(actual) == len(expected)', kpi=kpi, actual=actual, expected=expected)
+			self.assertThat('all(abs(a - e) < 0.0001 for a, e in zip(actual, expected))', kpi=kpi, actual=actual, expected=expected)
@@ -0,0 +1,63 @@
+__pysys_title__   = r""" Category Performance - CPU time of the Oee block attributed to its EPL actions """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Drives a generated stream of events through models spread across the four calculation 
+	paths with the correlator CPU profiler enabled, and turns the profile into a ranked report of the time spent in 
+	each action of the block: CPU and cumulative time, samples and time per activation. The report is kept as 
+	profile.json and profile.txt in the output directory, so it can be compared between builds. 
+	
+	The workload can be changed with -Xmodels=, -Xrate=, -XoutOfOrder=, -Xgap= and -Xduration=, the ranking 
+	summary is appended to a file for comparison with -XbenchmarkResults=. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	INTERVAL = 60.0
+	# number of models, spread across the calculation paths
+	models = 20
+	# activations per second and model
+	rate = 0.2
+	# fraction of activations that arrive late
+	outOfOrder = 0.01
+	# length of an outage in seconds
+	gap = 600.0
+	# length of the generated stream in seconds
+	duration = 3600.0
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.modelPaths = [(self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.PATH_INPUTS[i % 4 + 1],
+								 parameters={'0:interval':self.INTERVAL,'0:ica':100.0}), i % 4 + 1)
+						for i in range(int(self.models))]
+
+		events, activations = self.loadEvents(self.modelPaths, float(self.duration), float(self.rate), float(self.outOfOrder), float(self.gap))
+		# a trailing tick processes the last activation and drains the output queues
+		events.append(self.timestamp(30 + float(self.duration) + self.INTERVAL))
+
+		self.startCpuProfile(correlator)
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+		profile = self.stopCpuProfile(correlator)
+
+		self.report = self.cpuProfileReport(profile, activations)
+		self.outputs = self.outputsByModel('timestamp')
+		self.writeBenchmarkResults({
+			'models': len(self.modelPaths),
+			'rate': float(self.rate),
+			'outOfOrder': float(self.outOfOrder),
+			'gap': float(self.gap),
+			'duration': float(self.duration),
+			'activations': activations,
+			'actions': {row['action']: row['cpuTimePerActivation'] for row in self.report},
+		})
+
+	def validate(self):
+		self.assertThat('len(outputs) == len(models)', outputs=self.outputs, models=self.modelPaths)
+		actions = [row['action'] for row in self.report]
+		self.assertThat('len(actions) > 0', actions=actions)
+		self.assertThat('any(a.endswith(".Oee.$process") for a in actions)', actions=actions)
+		self.assertThat('ranks == list(range(1, len(actions) + 1))', ranks=[row['rank'] for row in self.report], actions=actions)
+		self.assertThat('abs(sum(shares) - 1.0) < 0.001', shares=[row['share'] for row in self.report])
@@ -0,0 +1,50 @@
+__pysys_title__   = r""" Category Performance - Expression evaluation throughput with compiled expressions """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Measures evaluations/sec of recompiling versus cached expressions and of untyped versus typed 
+	compiled expressions, parsers/sec of parsing versus sharing expressions from the ExpressionCache and the 
+	activations/sec of the block. The rates are recorded as benchmark results rather than compared, as they depend 
+	on the load of the machine, only the results of the expressions and the outputs are validated. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+import os, time
+
+class PySysTest(OeeBaseTest):
+
+	INTERVALS = 500
+	
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		correlator.injectEPL([os.path.join(self.input, 'ExpressionBenchmark.mon')])
+		self.waitForSignal(os.path.basename(correlator.logfile), expr='ExpressionBenchmark: ')
+
+		modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', 
+								 inputs={'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None},
+								 parameters={'0:interval':60.0,'0:ica':10.0})
+		events = []
+		for i in range(self.INTERVALS):
+			events.extend([self.timestamp(30 + i * 60),
+							self.inputEvent('status', i % 5 != 0, id=modelId),
+							self.inputEvent('amount', 2, id=modelId),
+							self.inputEvent('amount_ok', 1, id=modelId)])
+		events.append(self.timestamp(30 + self.INTERVALS * 60))
+		start = time.time()
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+		elapsed = time.time() - start
+
+		recompiled, cached, parsed, shared, untyped, typed, self.mismatches = self.getExprFromFile(os.path.basename(correlator.logfile), 
+								'ExpressionBenchmark: recompiled=([0-9]+) cached=([0-9]+) evaluations/sec, parsed=([0-9]+) shared=([0-9]+) parsers/sec, '
+								'untyped=([0-9]+) typed=([0-9]+) evaluations/sec, mismatches=([0-9]+)', groups=[1, 2, 3, 4, 5, 6, 7])
+		self.writeBenchmarkResults({
+			'expressionEvaluationsPerSec': {'recompiled': int(recompiled), 'cached': int(cached)},
+			'expressionSetupsPerSec': {'parsed': int(parsed), 'shared': int(shared)},
+			'typedEvaluationsPerSec': {'untyped': int(untyped), 'typed': int(typed)},
+			'blockActivationsPerSec': (self.INTERVALS * 3) / elapsed,
+		}, name='throughput.json')
+
+	def validate(self):
+		self.assertThat('mismatches == "0"', mismatches=self.mismatches)
+		self.assertThat('len(oee) == expected', oee=self.details('OEE'), expected=self.INTERVALS - 1)
@@ -0,0 +1,61 @@
+__pysys_title__   = r""" Category OEE - Interim outputs of the interval in progress, at most once per interim interval """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Inputs arrive every 10 to 20 seconds with an interim interval of 20 seconds. The interim outputs
+	show the KPIs from the start of the interval up to the inputs, are not output more often than every 20 seconds
+	and do not change the final result of the interval. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', 
+								 inputs={'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None},
+								 parameters={'0:interval':60.0,'0:ica':100.0,'0:interimInterval':20.0})
+		self.sendEventStrings(correlator,
+							  self.timestamp(30),
+							  self.inputEvent('status', True, id=self.modelId),
+							  self.inputEvent('amount', 2, id=self.modelId),
+							  self.inputEvent('amount_ok', 1, id=self.modelId),
+							  self.timestamp(40),
+							  self.inputEvent('amount', 2, id=self.modelId),
+							  self.inputEvent('amount_ok', 1, id=self.modelId),
+							  # less than 20 seconds after the previous interim output
+							  self.timestamp(50),
+							  self.inputEvent('amount', 2, id=self.modelId),
+							  self.inputEvent('amount_ok', 1, id=self.modelId),
+							  self.timestamp(60),
+							  self.inputEvent('status', False, id=self.modelId),
+							  self.inputEvent('amount', 2, id=self.modelId),
+							  self.inputEvent('amount_ok', 1, id=self.modelId),
+							  self.timestamp(75),
+							  self.inputEvent('amount', 0, id=self.modelId),
+							  self.inputEvent('amount_ok', 0, id=self.modelId),
+							  self.timestamp(80),
+							  self.inputEvent('status', True, id=self.modelId),
+							  # completes the first interval and starts the interim results of the next one
+							  self.timestamp(100),
+							  self.inputEvent('amount', 2, id=self.modelId),
+							  self.inputEvent('amount_ok', 1, id=self.modelId),
+							  self.timestamp(110),
+							  )
+		correlator.flush()
+
+	def validate(self):
+		interim = lambda kpi: self.details(kpi, self.modelId, outputId='interim_details')
+		self.assertThat('times == expected', times=[evt['time'] for evt in self.outputsByModel('interim_oee')[self.modelId]], 
+						expected=[40.0, 60.0, 80.0, 100.0])
+		self.assertThat('ppt == expected', ppt=interim('PotentialProductionTime'), expected=[10.0, 30.0, 50.0, 10.0])
+		self.assertThat('apt == expected', apt=interim('ActualProductionTime'), expected=[10.0, 30.0, 30.0, 10.0])
+		self.assertThat('apa == expected', apa=interim('ActualProductionAmount')[:3], expected=[4.0, 8.0, 8.0])
+		self.assertThat('availability == expected', availability=interim('Availability')[:3], expected=[1.0, 1.0, 0.6])
+		self.assertThat('performance == expected', performance=interim('Performance')[:3], expected=[0.24, 0.16, 0.16])
+		self.assertThat('oee == expected', oee=interim('OEE')[:3], expected=[0.12, 0.08, 0.048])
+		self.assertThat('interim == details', interim=[evt['value'] for evt in self.outputsByModel('interim_oee')[self.modelId]], details=interim('OEE'))
+		# the final result of the first interval is the same as without interim outputs
+		self.assertBlockOutput('timestamp', [90.0])
+		self.assertMatchesBackfill(60.0, 100.0, self.modelId)
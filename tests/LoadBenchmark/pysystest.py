@@ -0,0 +1,85 @@
+__pysys_title__   = r""" Category Performance - Throughput, resources and latency of many models under load """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Drives 1, 100 and 1000 models, spread across the four calculation paths, with a generated 
+	stream of events including late activations and an outage. Records events/sec, correlator CPU and resident 
+	memory, and the latency from interval end to output in benchmark.json. 
+	
+	The load can be changed with -Xrate=, -XoutOfOrder=, -Xgap= and -Xduration=, results are appended to a file 
+	for comparison between releases with -XbenchmarkResults=. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+__pysys_modes__ = r""" 
+	lambda helper: [
+		{'mode':'1model', 'models':1},
+		{'mode':'100models', 'models':100},
+		{'mode':'1000models', 'models':1000},
+	]
+	"""
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+import time
+
+class PySysTest(OeeBaseTest):
+
+	INTERVAL = 60.0
+	# activations per second and model
+	rate = 0.2
+	# fraction of activations that arrive late
+	outOfOrder = 0.01
+	# length of an outage in seconds
+	gap = 600.0
+	# length of the generated stream in seconds
+	duration = 3600.0
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.models = [(self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.PATH_INPUTS[i % 4 + 1],
+								 parameters={'0:interval':self.INTERVAL,'0:ica':100.0}), i % 4 + 1)
+						for i in range(self.mode.params['models'])]
+
+		start = time.time()
+		events, activations = self.loadEvents(self.models, float(self.duration), float(self.rate), float(self.outOfOrder), float(self.gap))
+		# a trailing tick processes the last activation and drains the output queues
+		events.append(self.timestamp(30 + float(self.duration) + self.INTERVAL))
+		generated = time.time()
+		self.log.info('Generated %d events in %.1fs', len(events), generated - start)
+
+		cpuBefore, rssBefore = self.processResources(correlator.process)
+		start = time.time()
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+		elapsed = time.time() - start
+		cpuAfter, rssAfter = self.processResources(correlator.process)
+
+		self.outputs = self.outputsByModel('timestamp')
+		latency = sorted(evt['time'] - evt['value'] for outputs in self.outputs.values() for evt in outputs)
+		self.writeBenchmarkResults({
+			'models': len(self.models),
+			'rate': float(self.rate),
+			'outOfOrder': float(self.outOfOrder),
+			'gap': float(self.gap),
+			'duration': float(self.duration),
+			'activations': activations,
+			'events': len(events),
+			'eventsPerSec': len(events) / elapsed,
+			'correlatorCpuSecs': cpuAfter - cpuBefore if cpuBefore is not None else None,
+			'correlatorRssKB': rssAfter,
+			'correlatorRssGrowthKB': rssAfter - rssBefore if rssBefore is not None else None,
+			'outputs': len(latency),
+			'latencySecs': {
+				'mean': sum(latency) / len(latency),
+				'p50': latency[len(latency) // 2],
+				'p99': latency[int(len(latency) * 0.99)],
+				'max': latency[-1],
+			} if latency else None,
+		})
+
+	def validate(self):
+		intervals = int(float(self.duration) / self.INTERVAL)
+		self.assertThat('len(outputs) == len(models)', outputs=self.outputs, models=self.models)
+		for modelId, path in self.models:
+			timestamps = [evt['value'] for evt in self.outputs.get(modelId, [])]
+			self.assertThat('len(timestamps) >= expected', modelId=modelId, timestamps=timestamps, expected=intervals - 1)
+			self.assertThat('timestamps == sorted(timestamps)', modelId=modelId, timestamps=timestamps)
@@ -0,0 +1,47 @@
+__pysys_title__   = r""" Category Monitoring - Metrics of the block are reported to the correlator log """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" The inputs of OeeBlock_001 with a metrics interval of 60 seconds. The block logs its metrics as 
+	JSON every 60 seconds of activations, with cumulative counters and the maxima of the period. The device is 
+	offline after 460, the amount at 600 completes the intervals ending at 510 and 570 at once, which counts as a 
+	catch-up. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+import json, os
+
+class PySysTest(OeeBaseTest):
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', 
+								 inputs={'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None},
+								 parameters={'0:interval':60.0,'0:ica':10.0,'0:metricsInterval':60.0})
+		events = []
+		for t in [30, 70, 110, 150, 190, 230, 270, 310, 350, 360, 390, 430, 460, 500, 600, 700]:
+			events.append(self.timestamp(t))
+			if t in (30, 310, 350):
+				events.append(self.inputEvent('status', t != 310, id=modelId))
+			if t not in (350, 500, 700):
+				amount = 0 if t == 310 else 2
+				events += [self.inputEvent('amount', amount, id=modelId), self.inputEvent('amount_ok', amount // 2, id=modelId)]
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+		self.reports = [json.loads(r) for r in self.getExprFromFile(os.path.basename(correlator.logfile), 'OEE metrics (.*)', returnAll=True)]
+
+	def validate(self):
+		self.assertBlockOutput('timestamp', [90.0, 150.0, 210.0, 270.0, 330.0, 390.0, 450.0, 510.0, 570.0])
+		# reported at the first activations 60 seconds after the previous report: 110, 190, 270, 350, 430 and 600
+		self.assertThat('len(reports) == 6', reports=self.reports)
+		self.assertThat('intervals == 6', intervals=self.reports[-2]['intervals'])
+		self.assertThat('catchUps == 0', catchUps=self.reports[-2]['catchUps'])
+		last = self.reports[-1]
+		self.assertThat('activations == 13', activations=last['activations'])
+		# the result for 570 is output after the report, catchUpDelay later
+		self.assertThat('intervals == 8', intervals=last['intervals'])
+		self.assertThat('partitions == 1', partitions=last['partitions'])
+		self.assertThat('catchUps == 1', catchUps=last['catchUps'])
+		self.assertThat('processingTime > 0', processingTime=last['processingTime'])
+		self.assertThat('all(r["maxStatusHistory"] > 0 for r in reports)', reports=self.reports)
+		self.assertThat('deepestPartition != ""', deepestPartition=last['deepestPartition'])
@@ -0,0 +1,54 @@
+__pysys_title__   = r""" Category Group - OEE of a group of assets weighted by their time and amount components """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Three assets report their results to the OeeGroup block as partitions of one model. The first 
+	interval is output as soon as all three reported, the second after the maximum wait without the missing asset, 
+	and a late result for the second interval is ignored. All results are output on the group partition, not on 
+	the partition of the asset that completed the interval or was the first to report it. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	def assetDetails(self, apt, alt, imr, iqt, apa, aqa):
+		return {'ActualProductionTime': apt, 'AvailabilityLossTime': alt, 'IdealMachineRuntime': imr, 'IdealQualityTime': iqt,
+				'ActualProductionAmount': apa, 'ActualQualityAmount': aqa, 'QualityLossAmount': apa - aqa}
+    
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		modelId = self.createTestModel('apamax.analyticsbuilder.oee.OeeGroup', 
+								 inputs={'details':'pulse'},
+								 parameters={'0:assets':3,'0:maxWait':30.0,'0:groupPartition':'line'})
+		self.sendEventStrings(correlator,
+							  self.timestamp(60),
+							  self.inputEvent('details', True, id=modelId, partition='A', properties=self.assetDetails(60.0, 0.0, 30.0, 27.0, 15.0, 13.5)),
+							  self.timestamp(60.5),
+							  self.inputEvent('details', True, id=modelId, partition='B', time=60.0, properties=self.assetDetails(30.0, 30.0, 30.0, 30.0, 15.0, 15.0)),
+							  self.timestamp(61),
+							  self.inputEvent('details', True, id=modelId, partition='C', time=60.0, properties=self.assetDetails(60.0, 0.0, 60.0, 54.0, 30.0, 27.0)),
+							  self.timestamp(120),
+							  self.inputEvent('details', True, id=modelId, partition='A', properties=self.assetDetails(60.0, 0.0, 30.0, 27.0, 15.0, 13.5)),
+							  self.timestamp(121),
+							  self.inputEvent('details', True, id=modelId, partition='B', time=120.0, properties=self.assetDetails(30.0, 30.0, 30.0, 30.0, 15.0, 15.0)),
+							  # C does not report the second interval in time
+							  self.timestamp(160),
+							  self.inputEvent('details', True, id=modelId, partition='C', time=120.0, properties=self.assetDetails(60.0, 0.0, 60.0, 54.0, 30.0, 27.0)),
+							  self.timestamp(200),
+							  )
+		correlator.flush()
+
+	def validate(self):
+		self.assertBlockOutput('timestamp', [60.0, 120.0])
+		for output in ['timestamp', 'oee', 'details']:
+			partitions = [evt['partitionId'] for evt in self.outputIndex().select('model_0', output)]
+			self.assertThat('partitions == expected', output=output, partitions=partitions, expected=['line', 'line'])
+		self.assertBlockOutput('availability', [0.8333, 0.75])
+		self.assertBlockOutput('performance', [0.8, 0.6667])
+		self.assertBlockOutput('quality', [0.925, 0.95])
+		self.assertBlockOutput('oee', [0.6167, 0.475])
+		self.assertThat('assets == expected', assets=self.details('Assets'), expected=[3.0, 2.0])
+		self.assertThat('missing == expected', missing=self.details('MissingAssets'), expected=[0.0, 1.0])
+		self.assertThat('ppt == expected', ppt=self.details('PotentialProductionTime'), expected=[180.0, 120.0])
+		self.assertThat('apa == expected', apa=self.details('ActualProductionAmount'), expected=[60.0, 30.0])
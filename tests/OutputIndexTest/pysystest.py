@@ -0,0 +1,51 @@
+__pysys_title__   = r""" Category Framework - Outputs read incrementally from the correlator log """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Two partitions of a model report for a few intervals. The outputs are queried in the middle of 
+	the run and after it, so the second query only parses the rest of the log. The results of details, the KPI series 
+	and queries by partition and time match the outputs extracted from the whole log at once. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	KPIS = ['OEE', 'Availability', 'Performance', 'Quality']
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', 
+								 inputs={'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None},
+								 parameters={'0:interval':60.0,'0:ica':10.0})
+		self.sendEventStrings(correlator, *self.inputs(30, 200))
+		correlator.flush()
+		self.midRun = self.details('OEE', self.modelId, partitionId='A')
+		self.sendEventStrings(correlator, *self.inputs(200, 400))
+		correlator.flush()
+
+	def inputs(self, start, end):
+		events = []
+		for t in range(start, end, 10):
+			events.append(self.timestamp(t))
+			for partition, amount in [('A', 2), ('B', 3)]:
+				events += [self.inputEvent('status', t % 120 != 0, id=self.modelId, partition=partition),
+						   self.inputEvent('amount', amount, id=self.modelId, partition=partition),
+						   self.inputEvent('amount_ok', amount - 1, id=self.modelId, partition=partition)]
+		return events
+
+	def validate(self):
+		events = [evt for evt in self.apama.extractEventLoggerOutput(self.analyticsBuilderCorrelator.logfile)
+				  if evt['modelId'] == self.modelId and evt['outputId'] == 'details']
+		self.assertThat('0 < len(midRun) < len(details)', midRun=self.midRun, details=[evt for evt in events if evt['partitionId'] == 'A'])
+		for partitionId in ['A', 'B']:
+			for kpi in self.KPIS:
+				expected = [evt['properties'][kpi] for evt in events if evt['partitionId'] == partitionId]
+				self.assertThat('details == expected', kpi=kpi, partitionId=partitionId, 
+								details=self.details(kpi, self.modelId, partitionId=partitionId), expected=expected)
+				self.assertThat('series == expected', kpi=kpi, partitionId=partitionId, 
+								series=list(self.series(kpi, self.modelId, partitionId=partitionId)), expected=expected)
+		for evt in events:
+			self.assertThat('details == expected', time=evt['time'], 
+							details=self.details('OEE', self.modelId, partitionId=evt['partitionId'], time=evt['time']), expected=[evt['properties']['OEE']])
+		self.assertThat('len(details) == len(events)', details=self.details('OEE', self.modelId), events=events)
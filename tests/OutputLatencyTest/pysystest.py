@@ -0,0 +1,56 @@
+__pysys_title__   = r""" Category Performance - Latency from interval end to output """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Measures the time between the end of an interval and the output of its result. A result 
+	completed by an input is output by the same activation, results completed together after an outage are 
+	output in order from the output queue, catchUpDelay apart. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+import json, os
+
+class PySysTest(OeeBaseTest):
+
+	INTERVAL = 60.0
+	MISSED = 10
+	CATCH_UP_DELAY = 0.1
+    
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', 
+								 inputs={'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None},
+								 parameters={'0:interval':self.INTERVAL,'0:ica':10.0,'0:catchUpDelay':self.CATCH_UP_DELAY})
+		reconnect = 90 + self.INTERVAL * self.MISSED
+		self.sendEventStrings(correlator,
+							  self.timestamp(30),
+							  self.inputEvent('status', True, id=modelId),
+							  self.inputEvent('amount', 0, id=modelId),
+							  self.inputEvent('amount_ok', 0, id=modelId),
+							  self.timestamp(90),
+							  self.inputEvent('status', True, id=modelId),
+							  self.inputEvent('amount', 1, id=modelId),
+							  self.inputEvent('amount_ok', 1, id=modelId),
+							  self.timestamp(reconnect),
+							  self.inputEvent('status', True, id=modelId),
+							  self.inputEvent('amount', self.MISSED, id=modelId),
+							  self.inputEvent('amount_ok', self.MISSED, id=modelId),
+							  self.timestamp(reconnect + 5),
+							  )
+		correlator.flush()
+
+		outputs = [evt for evt in self.apama.extractEventLoggerOutput(correlator.logfile) if evt['outputId'] == 'timestamp']
+		self.latency = [{'intervalEnd': evt['value'], 'output': evt['time'], 'latency': round(evt['time'] - evt['value'], 3)} 
+						for evt in outputs]
+		with open(os.path.join(self.output, 'latency.json'), 'w') as f:
+			json.dump(self.latency, f, indent=2)
+		self.log.info('Latency from interval end to output: %s', [l['latency'] for l in self.latency])
+
+	def validate(self):
+		self.assertBlockOutput('timestamp', [90.0 + self.INTERVAL * i for i in range(self.MISSED + 1)])
+		# completed by the input at the end of the interval: output by the same activation
+		self.assertThat('latency == 0.0', latency=self.latency[0]['latency'])
+		# completed by reconnecting: the first is output right away, the rest follow catchUpDelay apart
+		self.assertThat('latency == expected', latency=self.latency[1]['latency'], expected=self.INTERVAL * (self.MISSED - 1))
+		gaps = [round(b['output'] - a['output'], 3) for a, b in zip(self.latency[1:], self.latency[2:])]
+		self.assertThat('gaps == expected', gaps=gaps, expected=[self.CATCH_UP_DELAY] * (self.MISSED - 1))
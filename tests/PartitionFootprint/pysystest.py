@@ -0,0 +1,61 @@
+__pysys_title__   = r""" Category Performance - Memory per partition and eviction of idle partitions """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Measures the correlator memory used per partition with a few thousand partitions reporting, 
+	written to footprint.json. After the idle timeout the interval in progress is closed with the inputs received 
+	so far and the state of the partitions is dropped, so a partition that reports again starts a new calculation 
+	instead of catching up on the intervals it missed. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	PARTITIONS = 5000
+	IDLE_TIMEOUT = 600.0
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.PATH_INPUTS[1],
+								 parameters={'0:interval':60.0,'0:ica':10.0,'0:idleTimeout':self.IDLE_TIMEOUT})
+		events = []
+		for t in [30, 90, 150]:
+			events.append(self.timestamp(t))
+			for p in range(self.PARTITIONS):
+				events += [self.inputEvent('status', True, id=modelId, partition=f'device{p}'),
+						   self.inputEvent('amount', 1, id=modelId, partition=f'device{p}'),
+						   self.inputEvent('amount_ok', 1, id=modelId, partition=f'device{p}')]
+		events.append(self.timestamp(151))
+		_, rssBefore = self.processResources(correlator.process)
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+		_, rssActive = self.processResources(correlator.process)
+
+		# all partitions are idle for longer than the timeout, then one of them reports again
+		self.sendEventStrings(correlator, 
+							  self.timestamp(2000),
+							  self.inputEvent('status', True, id=modelId, partition='device0'),
+							  self.inputEvent('amount', 10, id=modelId, partition='device0'),
+							  self.inputEvent('amount_ok', 10, id=modelId, partition='device0'),
+							  self.timestamp(2001))
+		correlator.flush()
+		_, rssEvicted = self.processResources(correlator.process)
+
+		self.writeBenchmarkResults({
+			'partitions': self.PARTITIONS,
+			'bytesPerPartition': (rssActive - rssBefore) * 1024 / self.PARTITIONS if rssBefore is not None else None,
+			'correlatorRssKB': {'before': rssBefore, 'active': rssActive, 'evicted': rssEvicted},
+		}, name='footprint.json')
+
+	def validate(self):
+		# the interval from 150 is closed when the partitions become idle
+		self.assertThat('timestamps == expected', timestamps=self.partitionOutputs('device0'), expected=[90.0, 150.0, 210.0])
+		self.assertThat('timestamps == expected', timestamps=self.partitionOutputs('device1'), expected=[90.0, 150.0, 210.0])
+		availability = [evt['value'] for evt in self.apama.extractEventLoggerOutput(self.analyticsBuilderCorrelator.logfile)
+			if evt['outputId'] == 'availability' and evt['partitionId'] == 'device1']
+		self.assertThat('availability[-1] == 1.0', availability=availability)
+
+	def partitionOutputs(self, partitionId):
+		return [evt['value'] for evt in self.apama.extractEventLoggerOutput(self.analyticsBuilderCorrelator.logfile)
+			if evt['outputId'] == 'timestamp' and evt['partitionId'] == partitionId]
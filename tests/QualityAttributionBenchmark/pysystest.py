@@ -0,0 +1,26 @@
+__pysys_title__   = r""" Category Performance - Quality attribution with 10k parts per interval """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Micro-benchmark of AmountByQualityState as used by calculation path 2. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+import os
+
+class PySysTest(OeeBaseTest):
+    
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		correlator.injectEPL([os.path.join(self.input, 'QualityBenchmark.mon')])
+		self.logfile = os.path.basename(correlator.logfile)
+		self.waitForSignal(self.logfile, expr='QualityBenchmark: parts=')
+		self.log.info(self.getExprFromFile(self.logfile, 'QualityBenchmark: (parts=.*)'))
+
+	def validate(self):
+		self.assertThat('ok == expected', 
+						ok=self.getExprFromFile(self.logfile, 'QualityBenchmark: interval=[0-9]+ ok=([0-9.]+)', returnAll=True),
+						expected=['5000.0'] * 5)
+		self.assertThat('remaining == expected', 
+						remaining=self.getExprFromFile(self.logfile, 'remainingStates=([0-9]+)', returnAll=True),
+						expected=['1'] * 5)
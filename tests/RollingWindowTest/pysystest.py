@@ -0,0 +1,54 @@
+__pysys_title__   = r""" Category OEE - Rolling window outputs over the latest intervals """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" The inputs of OeeBlock_001 with a rolling window of three intervals. Each rolling output matches 
+	the components of the intervals in the window, summed up from the details output. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	INTERVAL = 60.0
+	WINDOW = 180.0
+	SUMMED = ['ActualProductionTime', 'AvailabilityLossTime', 'ActualProductionAmount', 'ActualQualityAmount', 'IdealMachineRuntime', 'IdealQualityTime']
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', 
+								 inputs={'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None},
+								 parameters={'0:interval':self.INTERVAL,'0:ica':10.0,'0:window':self.WINDOW})
+		events = []
+		for t in [30, 70, 110, 150, 190, 230, 270, 310, 350, 360, 390, 430, 460, 500]:
+			events.append(self.timestamp(t))
+			if t in (30, 310, 350):
+				events.append(self.inputEvent('status', t != 310, id=modelId))
+			if t != 350:
+				amount = 0 if t == 310 else 2
+				events += [self.inputEvent('amount', amount, id=modelId), self.inputEvent('amount_ok', amount // 2, id=modelId)]
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+
+	def validate(self):
+		self.assertBlockOutput('timestamp', [90.0, 150.0, 210.0, 270.0, 330.0, 390.0, 450.0])
+		times = self.details('ActualProductionTime', outputId='rolling_details')
+		self.assertThat('len(rolling) == 7', rolling=times)
+		intervals = [{c: v for c, v in zip(self.SUMMED, values)} for values in zip(*[self.details(c) for c in self.SUMMED])]
+		for i, end in enumerate([90.0, 150.0, 210.0, 270.0, 330.0, 390.0, 450.0]):
+			window = intervals[max(0, i - 2):i + 1]
+			total = {c: sum(interval[c] for interval in window) for c in self.SUMMED}
+			ppt = total['ActualProductionTime'] + total['AvailabilityLossTime']
+			availability = total['ActualProductionTime'] / ppt
+			performance = total['IdealMachineRuntime'] / total['ActualProductionTime']
+			quality = total['IdealQualityTime'] / total['IdealMachineRuntime'] if total['IdealMachineRuntime'] else 0.0
+			for kpi, expected in [('PotentialProductionTime', ppt), ('Availability', availability), ('Performance', performance), 
+								  ('Quality', quality), ('OEE', availability * performance * quality), 
+								  ('ActualProductionAmount', total['ActualProductionAmount'])]:
+				self.assertThat('abs(actual - expected) < 0.001', kpi=kpi, end=end, 
+								actual=self.details(kpi, outputId='rolling_details')[i], expected=expected)
+		self.assertThat('rolling == details', rolling=[evt['value'] for evt in self.outputsByModel('rolling_oee')['model_0']], 
+						details=self.details('OEE', outputId='rolling_details'))
+		# the window is full after three intervals
+		self.assertThat('ppt == expected', ppt=self.details('PotentialProductionTime', outputId='rolling_details'), 
+						expected=[60.0, 120.0, 180.0, 180.0, 180.0, 180.0, 180.0])
@@ -0,0 +1,57 @@
+__pysys_title__   = r""" Category OEE - The potential production time only covers the planned time of the shift plan """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" With a Monday to Friday early shift, the intervals over the weekend are not output and the
+	interval at the end of Friday's shift only counts its planned half. The machine runs for a while after the
+	end of Friday's shift, which does not count as production time. The details output matches the backfill
+	engine with the same plan. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	PLAN = 'Mon-Fri 06:00-14:00'
+	# Friday 2024-12-20 12:30 UTC
+	START = 1734697800.0
+	HOUR = 3600.0
+	DAY = 86400.0
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.modelId = self.createTestModel('apamax.analyticsbuilder.oee.Oee', 
+								 inputs={'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None},
+								 parameters={'0:interval':self.HOUR,'0:ica':100.0,'0:catchUpDelay':0.0,'0:shiftPlan':self.PLAN})
+		monday = self.START + 3 * self.DAY - 6.5 * self.HOUR
+		events = [self.timestamp(self.START), self.inputEvent('status', True, id=self.modelId)]
+		t = self.START
+		while t <= monday + 1.5 * self.HOUR:
+			if t > self.START:
+				events.append(self.timestamp(t))
+			events += [
+				self.inputEvent('amount', 0, id=self.modelId),
+				self.inputEvent('amount_ok', 0, id=self.modelId),
+			]
+			if t == self.START + self.HOUR:
+				# the machine stops 15 minutes before the end of Friday's shift
+				events += [self.timestamp(t + 0.25 * self.HOUR), self.inputEvent('status', False, id=self.modelId)]
+				# and runs for 20 minutes after the end of the shift, outside of the planned time
+				events += [self.timestamp(t + 0.5 * self.HOUR), self.inputEvent('status', True, id=self.modelId),
+						   self.timestamp(t + 0.5 * self.HOUR + 1200.0), self.inputEvent('status', False, id=self.modelId)]
+			if t == monday - 0.5 * self.HOUR:
+				# and starts again with Monday's shift
+				events += [self.timestamp(monday), self.inputEvent('status', True, id=self.modelId)]
+			t += self.HOUR
+		events.append(self.timestamp(t))
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+
+	def validate(self):
+		monday = self.START + 3 * self.DAY - 6.5 * self.HOUR
+		self.assertBlockOutput('timestamp',		[self.START + self.HOUR, self.START + 2 * self.HOUR, monday + 0.5 * self.HOUR, monday + 1.5 * self.HOUR])
+		self.assertBlockOutput('availability', 	[1.0,	0.5,	1.0,	1.0])
+		self.assertThat('output == expected', 
+						output=self.details('ActualProductionTime'), 
+						expected=				[3600.0, 900.0, 1800.0, 3600.0])
+		self.assertMatchesBackfill(self.HOUR, 100.0, self.modelId, shiftPlan=self.PLAN)
@@ -0,0 +1,65 @@
+__pysys_title__   = r""" Category OEE - Warm restart of a partition from a snapshot of its running state """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Two models receive the same inputs until a snapshot of the second one is taken in the middle 
+	of an interval, with status changes and amounts already received in it. The snapshot is stored in a file and 
+	restored into a third model, which only receives the inputs after the snapshot. Its results, including the 
+	interval the snapshot was taken in, match those of the model that received all inputs. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	INPUTS = {'status':'boolean', 'amount':'float', 'amount_ok':'float', 'amount_nok':None, 'qok':None, 'take_snapshot':'pulse', 'restore':'string'}
+	STATUS = {30: True, 120: False, 140: True, 160: False, 185: True, 250: False, 270: True}
+	SNAPSHOT = 175
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.reference, self.snapshotted, self.restored = [self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.INPUTS,
+								 parameters={'0:interval':60.0,'0:ica':10.0,'0:snapshots':True}) for i in range(3)]
+		events = []
+		for t in range(30, self.SNAPSHOT, 10):
+			events += self.inputs(t, [self.reference, self.snapshotted])
+		events += [self.timestamp(self.SNAPSHOT), self.inputEvent('take_snapshot', True, id=self.snapshotted), self.timestamp(self.SNAPSHOT + 1)]
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+
+		# the restored model only sees what happened after the snapshot
+		store = self.storeSnapshots('snapshots.json')
+		self.log.info('Stored snapshots in %s', store)
+		events = self.restoreEvents('snapshots.json', models={self.snapshotted: self.restored}) + [self.timestamp(self.SNAPSHOT + 2)]
+		for t in range(self.SNAPSHOT + 5, 400, 10):
+			events += self.inputs(t, [self.reference, self.restored])
+		events.append(self.timestamp(400))
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+
+	def inputs(self, t, models):
+		events = [self.timestamp(t)]
+		for modelId in models:
+			if t in self.STATUS:
+				events.append(self.inputEvent('status', self.STATUS[t], id=modelId))
+			amount = 3 if self.isUp(t) else 0
+			events += [self.inputEvent('amount', amount, id=modelId), self.inputEvent('amount_ok', amount - 1 if amount else 0, id=modelId)]
+		return events
+
+	def isUp(self, t):
+		return self.STATUS[max(s for s in self.STATUS if s <= t)]
+
+	def validate(self):
+		timestamps = {modelId: [evt['value'] for evt in outputs] for modelId, outputs in self.outputsByModel('timestamp').items()}
+		snapshots = self.outputsByModel('snapshot')
+		# one snapshot per completed interval and the one that was requested
+		self.assertThat('len(snapshots) == len(intervals) + 1', snapshots=snapshots[self.snapshotted], intervals=timestamps[self.snapshotted])
+		self.assertThat('snapshots[-1]["time"] == expected', snapshots=snapshots[self.snapshotted], expected=float(self.SNAPSHOT))
+
+		after = [i for i, t in enumerate(timestamps[self.reference]) if t > self.SNAPSHOT]
+		self.assertThat('restored == expected', restored=timestamps[self.restored], expected=[timestamps[self.reference][i] for i in after])
+		# the interval the snapshot was taken in is completed from the restored state
+		self.assertThat('restored[0] == 210.0', restored=timestamps[self.restored])
+		for kpi in ['OEE', 'Availability', 'Performance', 'Quality', 'ActualProductionTime', 'ActualProductionAmount', 'ActualQualityAmount']:
+			reference = self.details(kpi, self.reference)
+			self.assertThat('restored == expected', kpi=kpi, restored=self.details(kpi, self.restored), expected=[reference[i] for i in after])
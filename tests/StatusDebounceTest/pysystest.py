@@ -0,0 +1,62 @@
+__pysys_title__   = r""" Category Status - Repeated status inputs are coalesced and short flaps are debounced """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" The block evaluates the latest machine status and quality status on every activation, so 
+	the status inputs repeat with every amount. One model receives the status changes only, two others also receive 
+	flaps of each status that are reverted after 2 seconds, one of them with a debounce of 5 seconds. The machine 
+	status flaps are the first changes after an interval boundary. The debounced model has the same results as the 
+	one without flaps, the other one does not, and the repeated inputs do not grow the status history. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	INPUTS = {'status':'boolean', 'amount':'float', 'amount_ok':None, 'amount_nok':None, 'qok':'boolean'}
+	DOWN = (130, 170)
+	BAD = (200, 240)
+	# intervals end at 90, 150, ..., 390
+	FLAPS = {275: 'status', 305: 'qok', 331: 'status'}
+	CHANGES = 5
+
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		self.clean = self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.INPUTS,
+								 parameters={'0:interval':60.0,'0:ica':30.0})
+		self.debounced = self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.INPUTS,
+								 parameters={'0:interval':60.0,'0:ica':30.0,'0:debounce':5.0})
+		self.flapping = self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=self.INPUTS,
+								 parameters={'0:interval':60.0,'0:ica':30.0})
+		models = (self.clean, self.debounced, self.flapping)
+		events = []
+		for t in range(30, 400, 10):
+			events.append(self.timestamp(t))
+			if t in (30,) + self.DOWN + self.BAD:
+				status = not self.DOWN[0] <= t < self.DOWN[1]
+				qok = not self.BAD[0] <= t < self.BAD[1]
+				events += [self.inputEvent(name, value, id=model) for model in models for name, value in [('status', status), ('qok', qok)]]
+			events += [self.inputEvent('amount', 3, id=model) for model in models]
+			for flapped in range(t + 1, t + 10):
+				flap = self.FLAPS.get(flapped)
+				if flap:
+					events += [self.timestamp(flapped)] + [self.inputEvent(flap, False, id=model) for model in models[1:]]
+					events += [self.timestamp(flapped + 2)] + [self.inputEvent(flap, True, id=model) for model in models[1:]]
+		events.append(self.timestamp(400))
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+
+	def validate(self):
+		timestamps = self.outputsByModel('timestamp')
+		self.assertThat('len(debounced) == len(flapping) == len(clean) > 4', clean=timestamps[self.clean],
+						debounced=timestamps[self.debounced], flapping=timestamps[self.flapping])
+		for kpi in ['OEE', 'Availability', 'Performance', 'Quality', 'ActualProductionAmount', 'ActualQualityAmount', 'ActualProductionTime']:
+			expected = self.details(kpi, self.clean)
+			actual = self.details(kpi, self.debounced)
+			self.assertThat('len(actual) == len(expected)', kpi=kpi, actual=actual, expected=expected)
+			self.assertThat('all(abs(a - e) < 0.0001 for a, e in zip(actual, expected))', kpi=kpi, actual=actual, expected=expected)
+		# the flaps are not ignored without a debounce
+		self.assertThat('sum(flapping) < sum(expected)', flapping=self.details('ActualProductionTime', self.flapping),
+						expected=self.details('ActualProductionTime', self.clean))
+		for model in (self.clean, self.debounced):
+			self.assertThat('0 < max(depth) <= changes', depth=self.details('StatusHistoryDepth', model), changes=self.CHANGES)
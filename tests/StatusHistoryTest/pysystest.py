@@ -0,0 +1,54 @@
+__pysys_title__   = r""" Category Status - Status history stays within the configured limit """ 
+#                        ================================================================================
+__pysys_purpose__ = r""" Flapping machine status must not grow the retained status history beyond statusHistoryLimit. 
+	The up time of the discarded status changes is kept, so the actual production time and the split of an amount 
+	across intervals are the same as without a limit. """ 
+	
+__pysys_created__ = "2026-10-17"
+
+from basetest.OeeBaseTest import OeeBaseTest
+from pysys.constants import *
+
+class PySysTest(OeeBaseTest):
+
+	LIMIT = 4
+	AMOUNT = 120
+    
+	def execute(self):
+		correlator = self.startAnalyticsBuilderCorrelator(blockSourceDir=f'{self.project.SOURCE}/src/blocks/oee')
+		inputs = {'status':'boolean', 'amount':'float', 'amount_ok':'float' ,'amount_nok':None,'qok':None}
+		self.limited = self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=inputs,
+								 parameters={'0:interval':60.0,'0:ica':10.0,'0:statusHistoryLimit':self.LIMIT})
+		self.unlimited = self.createTestModel('apamax.analyticsbuilder.oee.Oee', inputs=inputs,
+								 parameters={'0:interval':60.0,'0:ica':10.0})
+		models = (self.limited, self.unlimited)
+		events = [self.timestamp(30)]
+		for model in models:
+			events += [self.inputEvent('status', True, id=model), self.inputEvent('amount', 1, id=model), self.inputEvent('amount_ok', 1, id=model)]
+		for t in range(31, 89):
+			events += [self.timestamp(t)] + [self.inputEvent('status', t % 2 == 0, id=model) for model in models]
+		# one amount for all intervals since the first one, split by their actual production times
+		events += [self.timestamp(90)] + [self.inputEvent('status', True, id=model) for model in models]
+		events += [self.timestamp(210)]
+		for model in models:
+			events += [self.inputEvent('amount', self.AMOUNT, id=model), self.inputEvent('amount_ok', self.AMOUNT, id=model)]
+		events.append(self.timestamp(220))
+		self.sendEventStrings(correlator, *events)
+		correlator.flush()
+
+	def validate(self):
+		for model in (self.limited, self.unlimited):
+			self.assertThat('timestamps == expected', timestamps=[evt['value'] for evt in self.outputsByModel('timestamp')[model]], 
+							expected=[90.0, 150.0, 210.0])
+			apt = self.details('ActualProductionTime', model)
+			amounts = self.details('ActualProductionAmount', model)
+			self.assertThat('len(amounts) == len(apt) == 3', amounts=amounts, apt=apt)
+			shares = [a - (1 if i == 0 else 0) for i, a in enumerate(amounts)]
+			self.assertThat('all(abs(share - total * t / sum(apt)) < 0.01 for share, t in zip(shares, apt))', 
+							shares=shares, total=self.AMOUNT, apt=apt)
+			# up 30-31 and on every even second from 32 to 88, until 90
+			self.assertThat('apt == expected', apt=apt[0], expected=31.0)
+		self.assertThat('limited == unlimited', limited=self.details('ActualProductionAmount', self.limited), 
+						unlimited=self.details('ActualProductionAmount', self.unlimited))
+		depth = self.details('StatusHistoryDepth', self.limited)
+		self.assertThat('0 < max(depth) <= limit', depth=depth, limit=self.LIMIT)